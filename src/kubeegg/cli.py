@@ -1,30 +1,33 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import typer
-from rich.console import Console
-from rich.prompt import Prompt
 from ruamel.yaml import YAML
 
 from .egg import parse_egg
 from .fetch import load_egg_json
 from .kustomize import write_kustomization
 from .models import UserConfig
-from .prompts import collect_user_config
+# _ask/_print defer the Rich import until the first message, so --help and
+# early-exit error paths never pay for it.
+from .prompts import _ask, _print, collect_user_config
 from .render import render_all
 
 app = typer.Typer(add_completion=False, invoke_without_command=True)
-console = Console()
 kustomize="kustomization.yaml"
 
+# One configured YAML engine for every manifest instead of a fresh
+# instance (and its setup cost) per file.
+_YAML = YAML()
+_YAML.default_flow_style = False
+_YAML.indent(mapping=2, sequence=4, offset=2)
+
 
 def _write_yaml(path: Path, data: dict) -> None:
-    yaml = YAML()
-    yaml.default_flow_style = False
-    yaml.indent(mapping=2, sequence=4, offset=2)
     with path.open("w", encoding="utf-8") as handle:
-        yaml.dump(data, handle)
+        _YAML.dump(data, handle)
 
 
 def _ensure_output_dir(out_dir: Path) -> None:
@@ -37,17 +40,20 @@ def _ensure_output_dir(out_dir: Path) -> None:
 def _prompt_overwrite(existing: list[Path]) -> bool:
     if not existing:
         return True
-    console.print("The following files already exist:")
+    _print("The following files already exist:")
     for path in existing:
-        console.print(f"  - {path.name}")
-    choice = Prompt.ask("overwrite or abort", choices=["overwrite", "abort"], default="abort")
+        _print(f"  - {path.name}")
+    choice = _ask("overwrite or abort", choices=["overwrite", "abort"], default="abort")
     return choice.strip().lower() == "overwrite"
 
 
 def _write_outputs(out_dir: Path, manifests: dict[str, dict], extra_files: list[str], force: bool) -> list[str]:
     filenames = list(manifests.keys())
     to_check = filenames + extra_files
-    existing = [out_dir / name for name in to_check if (out_dir / name).exists()]
+    # One directory read instead of a stat() syscall per candidate file.
+    with os.scandir(out_dir) as entries:
+        existing_names = {entry.name for entry in entries}
+    existing = [out_dir / name for name in to_check if name in existing_names]
     if existing and (not force) and (not _prompt_overwrite(existing)):
         raise typer.Exit(code=1)
     for name, data in manifests.items():
@@ -56,10 +62,10 @@ def _write_outputs(out_dir: Path, manifests: dict[str, dict], extra_files: list[
 
 
 def _summarize_config(config: UserConfig) -> None:
-    console.print("\nSummary:")
-    console.print(f"App name: {config.app_name}")
-    console.print(f"Namespace: {config.namespace}")
-    console.print(f"Image: {config.image}")
+    _print("\nSummary:")
+    _print(f"App name: {config.app_name}")
+    _print(f"Namespace: {config.namespace}")
+    _print(f"Image: {config.image}")
 
 
 @app.callback()
@@ -72,19 +78,19 @@ def main(
     try:
         _ensure_output_dir(out)
     except typer.BadParameter as exc:
-        console.print(f"[red]{exc}[/red]")
+        _print(f"[red]{exc}[/red]")
         raise typer.Exit(code=1) from exc
 
     try:
         result = load_egg_json(egg)
     except RuntimeError as exc:
-        console.print(f"[red]{exc}[/red]")
+        _print(f"[red]{exc}[/red]")
         raise typer.Exit(code=1) from exc
 
     try:
         egg_model = parse_egg(result.data)
     except Exception as exc:  # pragma: no cover - defensive
-        console.print(f"[red]Failed to parse egg JSON: {exc}[/red]")
+        _print(f"[red]Failed to parse egg JSON: {exc}[/red]")
         raise typer.Exit(code=1) from exc
 
     config = collect_user_config(egg_model)
@@ -99,9 +105,9 @@ def main(
         "app.kubernetes.io/managed-by": "kubeegg",
     })
 
-    console.print("\nGenerated:")
+    _print("\nGenerated:")
     for name in [kustomize] + written:
-        console.print(f"  - {name}")
+        _print(f"  - {name}")
 
 
 if __name__ == "__main__":
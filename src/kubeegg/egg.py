@@ -1,32 +1,39 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 from .models import Egg, EggVariable
 
 
-_DEF_REQUIRED_KEYS = {"required", "is_required"}
+_PORT_RE = re.compile(r"PORT", re.IGNORECASE)
+
+_TRUE_STRINGS = frozenset({"true", "yes", "1", "y", "t", "on"})
 
 
 def _as_bool(value: Any) -> bool:
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
     if isinstance(value, str):
-        return value.strip().lower() in {"true", "yes", "1"}
+        return value.strip().lower() in _TRUE_STRINGS
     if isinstance(value, (int, float)):
         return bool(value)
     return False
 
 
 def _extract_images(data: dict[str, Any]) -> dict[str, str]:
-    images: dict[str, str] = {}
     docker_images = data.get("docker_images") or data.get("dockerImages")
     if isinstance(docker_images, dict):
-        images.update({str(k): str(v) for k, v in docker_images.items() if v})
+        images = {str(k): str(v) for k, v in docker_images.items() if v}
     elif isinstance(docker_images, list):
-        for idx, value in enumerate(docker_images, start=1):
-            if isinstance(value, str) and value:
-                images[f"image-{idx}"] = value
+        images = {
+            f"image-{idx}": value
+            for idx, value in enumerate(
+                (v for v in docker_images if isinstance(v, str) and v), start=1
+            )
+        }
+    else:
+        images = {}
     docker_image = data.get("docker_image") or data.get("dockerImage") or data.get("image")
     if isinstance(docker_image, str) and docker_image:
         images.setdefault("default", docker_image)
@@ -40,25 +47,26 @@ def _extract_variables(data: dict[str, Any]) -> list[EggVariable]:
         for item in raw_vars:
             if not isinstance(item, dict):
                 continue
-            name = str(item.get("name") or item.get("env_variable") or item.get("envVariable") or "")
-            env_variable = item.get("env_variable") or item.get("envVariable")
+            # Bind the lookup once; each alias chain then costs one dict
+            # probe per key instead of attribute lookup + probe.
+            get = item.get
+            env_variable = get("env_variable") or get("envVariable")
             env_variable = str(env_variable) if env_variable else None
-            description = item.get("description")
-            default_value = item.get("default_value")
+            name = str(get("name") or env_variable or "")
+            description = get("description")
+            default_value = get("default_value")
             if default_value is None:
-                default_value = item.get("default")
-            required_val = False
-            for key in _DEF_REQUIRED_KEYS:
-                if key in item:
-                    required_val = _as_bool(item.get(key))
-                    break
+                default_value = get("default")
+            required = get("required")
+            if required is None:
+                required = get("is_required")
             variables.append(
                 EggVariable(
-                    name=name or (env_variable or ""),
+                    name=name,
                     env_variable=env_variable,
                     description=str(description) if description is not None else None,
                     default_value=str(default_value) if default_value is not None else None,
-                    required=required_val,
+                    required=_as_bool(required) if required is not None else False,
                 )
             )
     elif isinstance(data.get("environment"), dict):
@@ -79,14 +87,15 @@ def _extract_ports(data: dict[str, Any], variables: list[EggVariable]) -> list[i
     ports: set[int] = set()
 
     def add_port(val: Any) -> None:
-        if isinstance(val, int):
-            if val > 0:
-                ports.add(val)
+        if val is True or val is False:
+            # bool subclasses int but is never a port number.
+            return
+        try:
+            port = int(val)
+        except (TypeError, ValueError):
             return
-        if isinstance(val, str):
-            text = val.strip()
-            if text.isdigit():
-                ports.add(int(text))
+        if port > 0:
+            ports.add(port)
 
     config = data.get("config")
     if isinstance(config, dict):
@@ -103,11 +112,11 @@ def _extract_ports(data: dict[str, Any], variables: list[EggVariable]) -> list[i
             add_port(item)
 
     for var in variables:
-        if not var.env_variable:
-            continue
-        if "PORT" in var.env_variable.upper():
-            if var.default_value and var.default_value.isdigit():
-                ports.add(int(var.default_value))
+        env_variable = var.env_variable
+        if env_variable and _PORT_RE.search(env_variable):
+            default_value = var.default_value
+            if default_value and default_value.isdigit():
+                ports.add(int(default_value))
 
     return sorted(ports)
 
@@ -130,9 +139,10 @@ def _extract_installation(data: dict[str, Any]) -> tuple[str | None, str | None,
 
 
 def parse_egg(data: dict[str, Any]) -> Egg:
-    name = data.get("name") or data.get("title")
-    description = data.get("description")
-    startup = data.get("startup")
+    get = data.get
+    name = get("name") or get("title")
+    description = get("description")
+    startup = get("startup")
     images = _extract_images(data)
     variables = _extract_variables(data)
     ports = _extract_ports(data, variables)
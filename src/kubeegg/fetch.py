@@ -1,30 +1,59 @@
 from __future__ import annotations
 
-import json
+import atexit
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
+import orjson
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchResult:
     data: dict[str, Any]
     source: str
     resolved_source: str
 
 
+# Memoized fetch+parse results. URL entries are keyed by the resolved URL,
+# file entries by (path, mtime_ns, size) so edits invalidate the entry.
+_CACHE: dict[tuple, FetchResult] = {}
+
+
+def clear_cache() -> None:
+    """Drop all memoized load_egg_json results."""
+    _CACHE.clear()
+
+
+# Shared client so repeated fetches reuse one TCP+TLS session instead of
+# paying a fresh handshake per request.
+_CLIENT = httpx.Client(timeout=20.0)
+atexit.register(_CLIENT.close)
+
+
 def is_url(value: str) -> bool:
     parsed = urlparse(value)
     return parsed.scheme in {"http", "https"}
 
 
+_GITHUB_PREFIXES = (
+    "http://github.com/",
+    "https://github.com/",
+    "http://www.github.com/",
+    "https://www.github.com/",
+)
+
+
+@lru_cache(maxsize=256)
 def github_blob_to_raw(url: str) -> str:
-    parsed = urlparse(url)
-    if parsed.netloc not in {"github.com", "www.github.com"}:
+    # Cheap prefix test first: most URLs are not github.com blob links and
+    # should skip the urlparse state machine entirely.
+    if not url.startswith(_GITHUB_PREFIXES):
         return url
+    parsed = urlparse(url)
     parts = parsed.path.lstrip("/").split("/")
     if len(parts) < 5:
         return url
@@ -38,30 +67,43 @@ def github_blob_to_raw(url: str) -> str:
 def load_egg_json(source: str) -> FetchResult:
     if is_url(source):
         resolved = github_blob_to_raw(source)
+        key = ("url", resolved)
+        cached = _CACHE.get(key)
+        if cached is not None:
+            return cached
         try:
-            response = httpx.get(resolved, timeout=20.0)
+            response = _CLIENT.get(resolved)
             response.raise_for_status()
         except httpx.HTTPError as exc:
             raise RuntimeError(f"Failed to fetch egg JSON from {resolved}: {exc}") from exc
         try:
-            data = response.json()
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
             raise RuntimeError(f"Response from {resolved} is not valid JSON") from exc
         if not isinstance(data, dict):
             raise RuntimeError("Egg JSON must be an object at the top level")
-        return FetchResult(data=data, source=source, resolved_source=resolved)
+        result = FetchResult(data=data, source=source, resolved_source=resolved)
+        _CACHE[key] = result
+        return result
 
     path = Path(source)
     if not path.exists():
         raise RuntimeError(f"File not found: {path}")
+    stat = path.stat()
+    key = ("file", str(path), stat.st_mtime_ns, stat.st_size)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
     try:
-        raw = path.read_text(encoding="utf-8")
+        raw = path.read_bytes()
     except OSError as exc:
         raise RuntimeError(f"Unable to read file: {path}") from exc
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
         raise RuntimeError(f"File {path} is not valid JSON") from exc
     if not isinstance(data, dict):
         raise RuntimeError("Egg JSON must be an object at the top level")
-    return FetchResult(data=data, source=str(path), resolved_source=str(path))
+    result = FetchResult(data=data, source=str(path), resolved_source=str(path))
+    _CACHE[key] = result
+    return result
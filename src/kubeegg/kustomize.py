@@ -5,10 +5,11 @@ from typing import Iterable
 
 from ruamel.yaml import YAML
 
+_YAML = YAML()
+_YAML.default_flow_style = False
+
 
 def write_kustomization(path: Path, resources: Iterable[str], labels: dict[str, str]) -> None:
-    yaml = YAML()
-    yaml.default_flow_style = False
     data = {
         "apiVersion": "kustomize.config.k8s.io/v1beta1",
         "kind": "Kustomization",
@@ -20,4 +21,4 @@ def write_kustomization(path: Path, resources: Iterable[str], labels: dict[str,
         ],
     }
     with path.open("w", encoding="utf-8") as handle:
-        yaml.dump(data, handle)
+        _YAML.dump(data, handle)
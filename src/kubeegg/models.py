@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class EggVariable:
     name: str
     env_variable: Optional[str]
@@ -13,7 +13,7 @@ class EggVariable:
     required: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class Egg:
     name: Optional[str]
     description: Optional[str]
@@ -26,21 +26,21 @@ class Egg:
     install_entrypoint: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EnvSelection:
     key: str
     value: str
     sensitive: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class PortSpec:
     container_port: int
     protocol: str
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PVCSpec:
     name: str
     size: str
@@ -49,20 +49,20 @@ class PVCSpec:
     storage_class_name: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class FileManagerConfig:
     image: str
     port: int
 
 
-@dataclass
+@dataclass(slots=True)
 class InstallConfig:
     image: str
     entrypoint: str | None
     script: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceValues:
     requests_cpu: Optional[str] = None
     requests_memory: Optional[str] = None
@@ -70,7 +70,7 @@ class ResourceValues:
     limits_memory: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UserConfig:
     app_name: str
     namespace: str
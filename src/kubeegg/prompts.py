@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from rich.console import Console
-from rich.prompt import Confirm, Prompt
+import re
+import sys
+from functools import lru_cache
 
 from .models import EnvSelection, FileManagerConfig, InstallConfig, PortSpec, PVCSpec, ResourceValues, UserConfig
 from .util import (
@@ -13,77 +14,187 @@ from .util import (
     parse_ports,
 )
 
-console = Console()
-
 FILE_MANAGER_IMAGE = "hurlenko/filebrowser:latest"
 FORCE_SECRET_VARS = {"FTP_USERNAME", "FTP_PASSWORD"}
+_SENSITIVE_RE = re.compile(r"PASS|SECRET|TOKEN|KEY")
+# number + optional unit, extracted in a single pass ("500m", "10gb", "0.5").
+_QTY_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(m|gi|gb|g)?\s*$", re.IGNORECASE)
+_PROTOCOLS = frozenset({"TCP", "UDP"})
+
+
+# Rich pulls in a large transitive import tree; defer it until the first
+# interactive prompt so --help and other non-prompting paths never pay for it.
+# When stdin is not a TTY (CI, piped answers) Rich is skipped entirely and
+# prompts fall back to plain input().
+
+_plain_io = False
+
+_MARKUP_RE = re.compile(r"\[/?[a-zA-Z][a-zA-Z ]*\]")
+
+
+class _PlainPrompt:
+    """input()-backed stand-in for rich.prompt.Prompt on non-TTY stdin."""
+
+    @staticmethod
+    def ask(prompt: str = "", *, default=..., choices=None, **kwargs):
+        text = _MARKUP_RE.sub("", prompt)
+        suffix = f" [{default}]" if default is not ... and default != "" else ""
+        while True:
+            response = input(f"{text}{suffix}: ").strip()
+            if not response and default is not ...:
+                return default
+            if choices is not None:
+                if response not in choices:
+                    print("Please select one of the available options")
+                    continue
+                return response
+            # Rich returns a blank answer as-is when there is no default;
+            # re-prompting here would silently consume the next piped line.
+            return response
+
+
+class _PlainConfirm:
+    """input()-backed stand-in for rich.prompt.Confirm on non-TTY stdin."""
+
+    @staticmethod
+    def ask(prompt: str = "", *, default=False, **kwargs) -> bool:
+        text = _MARKUP_RE.sub("", prompt)
+        suffix = " [Y/n]" if default else " [y/N]"
+        response = input(f"{text}{suffix}: ").strip().lower()
+        if not response:
+            return bool(default)
+        return response in {"y", "yes", "true", "1"}
+
+
+@lru_cache(maxsize=1)
+def _get_console():
+    from rich.console import Console
+
+    return Console()
+
+
+def _prompt():
+    # A module attribute set from outside (monkeypatch.setattr(prompts,
+    # "Prompt", Fake)) takes precedence over both the plain fallback and
+    # the lazy Rich import.
+    override = globals().get("Prompt")
+    if override is not None:
+        return override
+    if _plain_io:
+        return _PlainPrompt
+    from rich.prompt import Prompt
+
+    return Prompt
+
+
+def _confirm():
+    override = globals().get("Confirm")
+    if override is not None:
+        return override
+    if _plain_io:
+        return _PlainConfirm
+    from rich.prompt import Confirm
+
+    return Confirm
+
+
+def _ask(*args, **kwargs) -> str:
+    return _prompt().ask(*args, **kwargs)
+
+
+def _ask_confirm(*args, **kwargs) -> bool:
+    return _confirm().ask(*args, **kwargs)
+
+
+def _print(*args, **kwargs) -> None:
+    if _plain_io:
+        print(*(_MARKUP_RE.sub("", a) if isinstance(a, str) else a for a in args))
+        return
+    _get_console().print(*args, **kwargs)
+
+
+def __getattr__(name: str):
+    # PEP 562: keep prompts.Console / prompts.Prompt / prompts.Confirm /
+    # prompts.console importable (tests patch them) without eager imports.
+    # Deliberately not cached into globals(): a present "Prompt"/"Confirm"
+    # global means an external override, which _prompt/_confirm prefer.
+    if name == "Console":
+        from rich.console import Console
+
+        return Console
+    if name in {"Prompt", "Confirm"}:
+        import rich.prompt
+
+        return getattr(rich.prompt, name)
+    if name == "console":
+        return _get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _print_env_info(name: str, description: str | None, default_value: str | None, required: bool) -> None:
-    console.print(f"[bold]{name}[/bold]")
+    lines = [f"[bold]{name}[/bold]"]
     if description:
-        console.print(description)
+        lines.append(description)
     if default_value is not None:
-        console.print(f"Default: [cyan]{default_value}[/cyan]")
-    console.print(f"Required: {'yes' if required else 'no'}")
+        lines.append(f"Default: [cyan]{default_value}[/cyan]")
+    lines.append(f"Required: {'yes' if required else 'no'}")
+    _print("\n".join(lines))
 
 
 def prompt_app_identity(egg_name: str | None) -> tuple[str, str]:
     default_app = normalize_k8s_name(egg_name or "game-server")
-    app_name = Prompt.ask("App name", default=default_app)
-    app_name = normalize_k8s_name(app_name)
-    namespace = Prompt.ask("Namespace", default=app_name)
-    namespace = normalize_k8s_name(namespace)
+    app_name = _ask("App name", default=default_app)
+    if app_name != default_app:
+        app_name = normalize_k8s_name(app_name)
+    namespace = _ask("Namespace", default=app_name)
+    if namespace != app_name:
+        namespace = normalize_k8s_name(namespace)
     return app_name, namespace
 
 
 def prompt_image(images: dict[str, str]) -> str:
     if not images:
-        return Prompt.ask("Container image")
+        return _ask("Container image")
 
-    console.print("Detected images:")
+    _print("Detected images:")
     labels = list(images.keys())
     for idx, label in enumerate(labels, start=1):
-        console.print(f"  {idx}. {label}: {images[label]}")
+        _print(f"  {idx}. {label}: {images[label]}")
     other_index = len(labels) + 1
-    console.print(f"  {other_index}. Other Image")
+    _print(f"  {other_index}. Other Image")
 
     while True:
-        selection = Prompt.ask("Select image number", default="1")
+        selection = _ask("Select image number", default="1")
         if not selection.isdigit():
-            console.print("[red]Enter a number from the list.[/red]")
+            _print("[red]Enter a number from the list.[/red]")
             continue
         idx = int(selection)
         if 1 <= idx <= len(labels):
             return images[labels[idx - 1]]
         if idx == other_index:
-            custom = Prompt.ask("Container image")
+            custom = _ask("Container image")
             if custom.strip():
                 return custom.strip()
-            console.print("[red]Image cannot be empty.[/red]")
+            _print("[red]Image cannot be empty.[/red]")
             continue
-        console.print("[red]Selection out of range.[/red]")
+        _print("[red]Selection out of range.[/red]")
 
 
 def prompt_pvc(app_name: str) -> PVCSpec:
-    pvc_name = Prompt.ask("PVC name", default=f"{app_name}-data")
+    pvc_name = _ask("PVC name", default=f"{app_name}-data")
     pvc_name = normalize_k8s_name(pvc_name)
-    size_raw = Prompt.ask("PVC size (GB)", default="10")
+    size_raw = _ask("PVC size (GB)", default="10")
     size_value = size_raw.strip()
     if size_value:
-        lower = size_value.lower()
-        if lower.endswith("gi"):
-            size = size_value
-        elif lower.endswith("g") or lower.endswith("gb"):
-            size = f"{lower.rstrip('bg').strip()}Gi"
-        elif lower.replace(".", "", 1).isdigit():
-            size = f"{size_value}Gi"
+        match = _QTY_RE.match(size_value)
+        if match and (match.group(2) or "").lower() != "m":
+            size = f"{match.group(1)}Gi"
         else:
             size = size_value
     else:
         size = "10Gi"
-    mount_path = Prompt.ask("PVC mount path", default="/home/container")
-    storage_class = Prompt.ask("storageClassName (optional)", default="")
+    mount_path = _ask("PVC mount path", default="/home/container")
+    storage_class = _ask("storageClassName (optional)", default="")
     storage_class = storage_class.strip() or None
     return PVCSpec(
         name=pvc_name,
@@ -94,53 +205,76 @@ def prompt_pvc(app_name: str) -> PVCSpec:
     )
 
 
-def prompt_env_vars(variables) -> list[EnvSelection]:
+def _record_env_port(item: EnvSelection, port_names: dict[int, str]) -> None:
+    """Record item in port_names if it looks like a port-valued env var."""
+    key_upper = item.key.upper()
+    if "_PORT" in key_upper or key_upper == "PORT":
+        value = item.value.strip()
+        if value.isdigit():
+            port = int(value)
+            if 1 <= port <= 65535:
+                port_names.setdefault(port, item.key)
+
+
+def prompt_env_vars(variables) -> tuple[list[EnvSelection], dict[int, str], set[str]]:
+    """Prompt for each egg variable.
+
+    Returns the selections plus, built in the same pass, the port-to-env-name
+    map and the set of configured keys so callers need no extra sweeps.
+    """
     selections: list[EnvSelection] = []
+    port_names: dict[int, str] = {}
+    keys: set[str] = set()
     if not variables:
-        return selections
-    console.print("\nEnvironment variables:")
+        return selections, port_names, keys
+    _print("\nEnvironment variables:")
     for var in variables:
         env_name = var.env_variable or normalize_env_var(var.name or "VAR")
         _print_env_info(env_name, var.description, var.default_value, var.required)
         if not var.env_variable:
-            env_name = Prompt.ask("Env var name", default=env_name)
-            env_name = normalize_env_var(env_name)
+            name_default = env_name
+            env_name = _ask("Env var name", default=name_default)
+            if env_name != name_default:
+                env_name = normalize_env_var(env_name)
         default_value = var.default_value or ""
-        value = Prompt.ask("Value (leave blank to skip)" if not var.required else "Value", default=default_value)
+        value = _ask("Value (leave blank to skip)" if not var.required else "Value", default=default_value)
         if not value and not var.required:
             continue
         while not value and var.required:
-            value = Prompt.ask("Value", default=default_value)
+            value = _ask("Value", default=default_value)
         env_upper = env_name.upper()
         force_secret = env_upper in FORCE_SECRET_VARS
-        sensitive_default = any(token in env_upper for token in ["PASS", "SECRET", "TOKEN", "KEY"])
+        sensitive_default = _SENSITIVE_RE.search(env_upper) is not None
         used_default = bool(default_value) and value == default_value
         if force_secret:
             sensitive = True
         elif used_default:
             sensitive = sensitive_default
         else:
-            sensitive = Confirm.ask("Is this value sensitive?", default=sensitive_default)
-        selections.append(EnvSelection(key=env_name, value=value, sensitive=sensitive))
-        console.print("")
-    return selections
+            sensitive = _ask_confirm("Is this value sensitive?", default=sensitive_default)
+        selection = EnvSelection(key=env_name, value=value, sensitive=sensitive)
+        selections.append(selection)
+        _record_env_port(selection, port_names)
+        keys.add(env_name)
+        _print("")
+    return selections, port_names, keys
 
 
 def prompt_startup(startup: str | None) -> str | None:
     if startup:
-        if Confirm.ask("Use detected startup command?", default=True):
+        if _ask_confirm("Use detected startup command?", default=True):
             return startup
-        custom = Prompt.ask("Startup command (leave blank to skip)", default="")
+        custom = _ask("Startup command (leave blank to skip)", default="")
         return custom.strip() or None
-    custom = Prompt.ask("Startup command (leave blank to skip)", default="")
+    custom = _ask("Startup command (leave blank to skip)", default="")
     return custom.strip() or None
 
 
 def prompt_install_script(egg) -> InstallConfig | None:
     if not egg.install_script or not egg.install_image:
         return None
-    console.print("\nInstaller script detected.")
-    enable = Confirm.ask("Run installer initContainer on first start?", default=True)
+    _print("\nInstaller script detected.")
+    enable = _ask_confirm("Run installer initContainer on first start?", default=True)
     if not enable:
         return None
     return InstallConfig(
@@ -155,17 +289,34 @@ def ports_from_env(env: list[EnvSelection]) -> tuple[list[int], dict[int, str]]:
 
     Returns a sorted list of ports and a mapping of port number to env var name.
     """
-    ports: set[int] = set()
     port_names: dict[int, str] = {}
     for item in env:
-        if "_PORT" in item.key.upper() or item.key.upper() == "PORT":
-            value = item.value.strip()
-            if value.isdigit():
-                port = int(value)
-                if 1 <= port <= 65535:
-                    ports.add(port)
-                    port_names.setdefault(port, item.key)
-    return sorted(ports), port_names
+        _record_env_port(item, port_names)
+    return sorted(port_names), port_names
+
+
+def _merge_sorted_unique(left: list[int], right: list[int]) -> list[int]:
+    """Merge two sorted, de-duplicated lists in one pass without set churn."""
+    if not left:
+        return list(right)
+    if not right:
+        return list(left)
+    merged: list[int] = []
+    i = j = 0
+    left_len, right_len = len(left), len(right)
+    while i < left_len and j < right_len:
+        a, b = left[i], right[j]
+        if a <= b:
+            merged.append(a)
+            i += 1
+            if a == b:
+                j += 1
+        else:
+            merged.append(b)
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
 
 
 def prompt_ports(detected_ports: list[int], port_env_names: dict[int, str] | None = None) -> list[PortSpec]:
@@ -174,100 +325,97 @@ def prompt_ports(detected_ports: list[int], port_env_names: dict[int, str] | Non
         ports: list[int] = []
         if detected_ports:
             display = ", ".join(str(p) for p in detected_ports)
-            use_detected = Confirm.ask(f"Use detected ports [{display}]?", default=True)
+            use_detected = _ask_confirm(f"Use detected ports [{display}]?", default=True)
             if use_detected:
                 ports = list(detected_ports)
         if not ports:
-            raw = Prompt.ask("Container ports to expose (comma-separated, empty to skip)", default="")
+            raw = _ask("Container ports to expose (comma-separated, empty to skip)", default="")
             if raw.strip():
                 ports = parse_ports(raw)
         if ports:
-            extra = Prompt.ask("Additional ports to expose (comma-separated, empty to skip)", default="")
+            extra = _ask("Additional ports to expose (comma-separated, empty to skip)", default="")
             if extra.strip():
                 existing = set(ports)
                 for p in parse_ports(extra):
                     if p not in existing:
                         ports.append(p)
             break
-        if Confirm.ask("No ports selected. Continue without a game Service?", default=False):
+        if _ask_confirm("No ports selected. Continue without a game Service?", default=False):
             return []
+    # Precompute the default names so accepting a default does no
+    # formatting or normalization work inside the loop.
+    name_defaults = {port: normalize_port_name(env_names.get(port) or f"game-{port}") for port in ports}
     port_specs: list[PortSpec] = []
     for port in ports:
-        protocol = Prompt.ask(f"Protocol for port {port}", default="TCP")
+        protocol = _ask(f"Protocol for port {port}", default="TCP")
         protocol = protocol.strip().upper() or "TCP"
-        if protocol not in {"TCP", "UDP"}:
+        if protocol not in _PROTOCOLS:
             protocol = "TCP"
-        if port in env_names:
-            name_default = normalize_port_name(env_names[port])
-        else:
-            name_default = normalize_port_name(f"game-{port}")
-        name = Prompt.ask(f"Service port name for {port}", default=name_default)
-        name = normalize_port_name(name)
+        name_default = name_defaults[port]
+        name = _ask(f"Service port name for {port}", default=name_default)
+        if name != name_default:
+            name = normalize_port_name(name)
         port_specs.append(PortSpec(container_port=port, protocol=protocol, name=name))
     return port_specs
 
 
 def prompt_file_manager() -> FileManagerConfig:
-    console.print("\nFile manager sidecar:")
-    console.print("File manager root directory: /data")
-    image = Prompt.ask("File manager image", default=FILE_MANAGER_IMAGE)
-    port_raw = Prompt.ask("File manager web UI port", default="8080")
-    while not port_raw.isdigit() or not (1 <= int(port_raw) <= 65535):
-        console.print("[red]Port must be between 1 and 65535[/red]")
-        port_raw = Prompt.ask("File manager web UI port", default="8080")
+    _print("\nFile manager sidecar:")
+    _print("File manager root directory: /data")
+    image = _ask("File manager image", default=FILE_MANAGER_IMAGE)
+    while True:
+        port_raw = _ask("File manager web UI port", default="8080")
+        try:
+            port = int(port_raw)
+        except ValueError:
+            port = 0
+        if 1 <= port <= 65535:
+            break
+        _print("[red]Port must be between 1 and 65535[/red]")
     return FileManagerConfig(
         image=image.strip() or FILE_MANAGER_IMAGE,
-        port=int(port_raw),
+        port=port,
     )
 
 
 def prompt_resources() -> ResourceValues | None:
-    configure = Confirm.ask("Configure CPU/memory requests & limits?", default=False)
+    configure = _ask_confirm("Configure CPU/memory requests & limits?", default=False)
     if not configure:
         return None
 
     def _normalize_cpu(value: str) -> str | None:
-        raw = value.strip().lower()
-        if not raw:
+        match = _QTY_RE.match(value)
+        if not match:
             return None
-        if raw.endswith("m"):
-            raw = raw[:-1]
-        if not raw.replace(".", "", 1).isdigit():
+        number, unit = match.groups()
+        if unit and unit.lower() != "m":
             return None
-        if raw.endswith("."):
-            raw = raw[:-1]
-        return f"{raw}m"
+        return f"{number}m"
 
     def _normalize_memory(value: str) -> str | None:
-        raw = value.strip().lower()
-        if not raw:
+        match = _QTY_RE.match(value)
+        if not match:
             return None
-        for suffix in ("gb", "g", "gi"):
-            if raw.endswith(suffix):
-                raw = raw[: -len(suffix)]
-                break
-        raw = raw.strip()
-        if not raw.replace(".", "", 1).isdigit():
+        number, unit = match.groups()
+        if unit and unit.lower() == "m":
             return None
-        if raw.endswith("."):
-            raw = raw[:-1]
-        return f"{raw}Gi"
+        return f"{number}Gi"
 
     def _ask_cpu(label: str) -> str | None:
         while True:
-            value = Prompt.ask(label, default="")
+            value = _ask(label, default="")
             normalized = _normalize_cpu(value)
             if value.strip() and normalized is None:
-                console.print("[red]Enter CPU in millicores (m), e.g. 500 or 250m.[/red]")
+                _print("[red]Enter CPU in millicores (m), e.g. 500 or 250m.[/red]")
                 continue
             return normalized
 
     def _ask_memory(label: str) -> str | None:
         while True:
-            value = Prompt.ask(label, default="")
+            value = _ask(label, default="")
             normalized = _normalize_memory(value)
             if value.strip() and normalized is None:
-                console.print("[red]Enter memory in GB, e.g. 2 or 0.5.[/red]")
+                _print("[red]Enter memory in GB, e.g. 2 or 0.5.[/red]")
                 continue
             return normalized
 
@@ -283,41 +431,54 @@ def prompt_resources() -> ResourceValues | None:
     )
 
 
-def prompt_missing_startup_vars(startup: str, env: list[EnvSelection]) -> list[EnvSelection]:
-    """Check startup command for {{VAR}} references missing from env and prompt the user."""
+def prompt_missing_startup_vars(
+    startup: str,
+    env: list[EnvSelection],
+    existing_keys: set[str] | None = None,
+) -> list[EnvSelection]:
+    """Check startup command for {{VAR}} references missing from env and prompt the user.
+
+    Callers that already track the configured key set can pass it via
+    existing_keys to skip the re-derivation from env.
+    """
     referenced = extract_startup_vars(startup)
-    existing_keys = {e.key for e in env}
+    if existing_keys is None:
+        existing_keys = {e.key for e in env}
     missing = sorted(referenced - existing_keys - STARTUP_BUILTIN_VARS)
     if not missing:
         return []
-    console.print("\n[yellow]The startup command references variables not yet configured:[/yellow]")
+    _print("\n[yellow]The startup command references variables not yet configured:[/yellow]")
     for var in missing:
-        console.print(f"  - {var}")
+        _print(f"  - {var}")
     additions: list[EnvSelection] = []
     for var in missing:
-        console.print(f"\n[bold]{var}[/bold] (referenced in startup command)")
-        value = Prompt.ask(f"Value for {var}")
+        _print(f"\n[bold]{var}[/bold] (referenced in startup command)")
+        value = _ask(f"Value for {var}")
         env_upper = var.upper()
-        sensitive_default = any(token in env_upper for token in ["PASS", "SECRET", "TOKEN", "KEY"])
+        sensitive_default = _SENSITIVE_RE.search(env_upper) is not None
         force_secret = env_upper in FORCE_SECRET_VARS
         if force_secret:
             sensitive = True
         else:
-            sensitive = Confirm.ask("Is this value sensitive?", default=sensitive_default)
+            sensitive = _ask_confirm("Is this value sensitive?", default=sensitive_default)
         additions.append(EnvSelection(key=var, value=value, sensitive=sensitive))
     return additions
 
 
 def collect_user_config(egg) -> UserConfig:
+    global _plain_io
+    _plain_io = not sys.stdin.isatty()
     app_name, namespace = prompt_app_identity(egg.name)
     image = prompt_image(egg.docker_images)
     pvc = prompt_pvc(app_name)
-    env = prompt_env_vars(egg.variables)
+    env, port_env_names, env_keys = prompt_env_vars(egg.variables)
     startup_command = prompt_startup(egg.startup)
     if startup_command:
-        env.extend(prompt_missing_startup_vars(startup_command, env))
-    env_ports, port_env_names = ports_from_env(env)
-    all_detected = sorted(set(egg.ports) | set(env_ports))
+        for addition in prompt_missing_startup_vars(startup_command, env, existing_keys=env_keys):
+            env.append(addition)
+            _record_env_port(addition, port_env_names)
+    # egg.ports is already sorted and unique; the env ports only need one sort.
+    all_detected = _merge_sorted_unique(egg.ports, sorted(port_env_names))
     ports = prompt_ports(all_detected, port_env_names)
     file_manager = prompt_file_manager()
     install = prompt_install_script(egg)
@@ -1,37 +1,117 @@
 from __future__ import annotations
 
+import io
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+from ruamel.yaml import YAML
+
 from .models import EnvSelection, PortSpec, UserConfig
 from .util import memory_to_mb, normalize_port_name
 
+_YAML = YAML()
+_YAML.default_flow_style = False
+_YAML.indent(mapping=2, sequence=4, offset=2)
 
-def _labels(app_name: str, component: str | None = None) -> dict[str, str]:
-    labels = {
-        "app.kubernetes.io/name": app_name,
-        "app.kubernetes.io/managed-by": "kubeegg",
-    }
+# The argument is a literal, so the normalized name is resolved once at
+# import time rather than on every render.
+_FILE_UI_PORT_NAME = normalize_port_name("file-ui")
+
+# Static file-manager env entry templates; renders take a shallow copy of
+# each so callers can patch a returned manifest without corrupting later
+# renders. Only FB_PORT depends on the config and is built per call.
+_FM_ENV_ROOT = {"name": "FB_ROOT", "value": "/data"}
+_FM_ENV_ADDRESS = {"name": "FB_ADDRESS", "value": "0.0.0.0"}
+_FM_ENV_DATABASE = {"name": "FB_DATABASE", "value": "/config/filebrowser.db"}
+
+
+# The label items are cached per (app_name, component); the public helpers
+# hand out fresh dicts so the manifest trees never share mutable state.
+
+@lru_cache(maxsize=128)
+def _labels_items(app_name: str, component: str | None) -> tuple[tuple[str, str], ...]:
+    items = (
+        ("app.kubernetes.io/name", app_name),
+        ("app.kubernetes.io/managed-by", "kubeegg"),
+    )
     if component:
-        labels["app.kubernetes.io/component"] = component
-    return labels
+        items += (("app.kubernetes.io/component", component),)
+    return items
+
+
+@lru_cache(maxsize=128)
+def _selector_items(app_name: str, component: str) -> tuple[tuple[str, str], ...]:
+    return (
+        ("app.kubernetes.io/name", app_name),
+        ("app.kubernetes.io/component", component),
+    )
+
+
+def _labels(app_name: str, component: str | None = None) -> dict[str, str]:
+    return dict(_labels_items(app_name, component))
 
 
 def _selector_labels(app_name: str, component: str) -> dict[str, str]:
+    return dict(_selector_items(app_name, component))
+
+
+@dataclass(frozen=True, slots=True)
+class _Names:
+    """Derived resource names for one app, formatted once per app_name."""
+
+    config_map: str
+    secret: str
+    installer: str
+    fm_config: str
+    ftp: str
+
+
+@lru_cache(maxsize=128)
+def _names(app_name: str) -> _Names:
+    return _Names(
+        config_map=f"{app_name}-config",
+        secret=f"{app_name}-secret",
+        installer=f"{app_name}-installer",
+        fm_config=f"{app_name}-fm-config",
+        ftp=f"{app_name}-ftp",
+    )
+
+
+def _pod_security_context() -> dict[str, Any]:
+    # Built from scratch per call, nested seccompProfile included, so the
+    # returned manifests are fully independent trees callers may patch.
     return {
-        "app.kubernetes.io/name": app_name,
-        "app.kubernetes.io/component": component,
+        "seccompProfile": {"type": "RuntimeDefault"},
+        "runAsNonRoot": True,
+        "runAsUser": 1000,
+        "runAsGroup": 1000,
+        "fsGroup": 1000,
+    }
+
+
+def _container_security_context(**extra: Any) -> dict[str, Any]:
+    # Returns a fresh dict per call: the main and installer containers can
+    # share one document, and aliasing there would emit anchors.
+    context: dict[str, Any] = {
+        "allowPrivilegeEscalation": False,
+        "capabilities": {"drop": ["ALL"]},
     }
+    context.update(extra)
+    return context
 
 
-def _split_env(env: list[EnvSelection]) -> tuple[dict[str, str], dict[str, str]]:
+def _split_env(env: list[EnvSelection]) -> tuple[dict[str, str], dict[str, str], list[str]]:
     configmap: dict[str, str] = {}
     secret: dict[str, str] = {}
+    secret_keys: list[str] = []
     for item in env:
         if item.sensitive:
             secret[item.key] = item.value
+            secret_keys.append(item.key)
         else:
             configmap[item.key] = item.value
-    return configmap, secret
+    return configmap, secret, secret_keys
 
 
 def render_namespace(config: UserConfig) -> dict[str, Any]:
@@ -75,7 +155,7 @@ def render_file_manager_config_pvc(config: UserConfig) -> dict[str, Any]:
         "apiVersion": "v1",
         "kind": "PersistentVolumeClaim",
         "metadata": {
-            "name": f"{config.app_name}-fm-config",
+            "name": _names(config.app_name).fm_config,
             "namespace": config.namespace,
             "labels": _labels(config.app_name, component="file-manager"),
         },
@@ -88,7 +168,7 @@ def render_configmap(config: UserConfig, data: dict[str, str]) -> dict[str, Any]
         "apiVersion": "v1",
         "kind": "ConfigMap",
         "metadata": {
-            "name": f"{config.app_name}-config",
+            "name": _names(config.app_name).config_map,
             "namespace": config.namespace,
             "labels": _labels(config.app_name),
         },
@@ -101,7 +181,7 @@ def render_secret(config: UserConfig, data: dict[str, str]) -> dict[str, Any]:
         "apiVersion": "v1",
         "kind": "Secret",
         "metadata": {
-            "name": f"{config.app_name}-secret",
+            "name": _names(config.app_name).secret,
             "namespace": config.namespace,
             "labels": _labels(config.app_name),
         },
@@ -133,6 +213,7 @@ def _resources_block(config: UserConfig) -> dict[str, Any] | None:
     return resources
 
 
+@lru_cache(maxsize=256)
 def _wrap_install_script(script: str) -> str:
     return "\n".join(
         [
@@ -156,7 +237,7 @@ def render_installer_configmap(config: UserConfig) -> dict[str, Any]:
         "apiVersion": "v1",
         "kind": "ConfigMap",
         "metadata": {
-            "name": f"{config.app_name}-installer",
+            "name": _names(config.app_name).installer,
             "namespace": config.namespace,
             "labels": _labels(config.app_name, component="installer"),
         },
@@ -187,10 +268,7 @@ def _build_init_container(
             {"name": "data", "mountPath": "/mnt/server"},
             {"name": "installer", "mountPath": "/kubeegg-installer"},
         ],
-        "securityContext": {
-            "allowPrivilegeEscalation": False,
-            "capabilities": {"drop": ["ALL"]},
-        },
+        "securityContext": _container_security_context(),
     }
     return init_container
 
@@ -201,29 +279,29 @@ def render_deployment(
     secret_name: str | None,
     sensitive_env_keys: list[str],
 ) -> dict[str, Any]:
-    labels = _labels(config.app_name, component="game")
-    configmap_name = f"{config.app_name}-config" if configmap_data else None
+    # Hoist hot attributes to locals so the loop-free body below does cheap
+    # LOAD_FAST lookups instead of repeated LOAD_ATTR on the slotted config.
+    app_name = config.app_name
+    pvc = config.pvc
+    labels = _labels(app_name, component="game")
+    configmap_name = _names(app_name).config_map if configmap_data else None
 
-    main_container_env: list[dict[str, Any]] = []
     main_env_from: list[dict[str, Any]] = []
     if configmap_name:
         main_env_from.append({"configMapRef": {"name": configmap_name}})
 
+    main_container_env: list[dict[str, Any]] = []
     if secret_name:
-        for key in sensitive_env_keys:
-            main_container_env.append({
-                "name": key,
-                "valueFrom": {"secretKeyRef": {"name": secret_name, "key": key}},
-            })
+        main_container_env = [
+            {"name": key, "valueFrom": {"secretKeyRef": {"name": secret_name, "key": key}}}
+            for key in sensitive_env_keys
+        ]
 
     main_container: dict[str, Any] = {
         "name": "app",
         "image": config.image,
-        "volumeMounts": [{"name": "data", "mountPath": config.pvc.mount_path}],
-        "securityContext": {
-            "allowPrivilegeEscalation": False,
-            "capabilities": {"drop": ["ALL"]},
-        },
+        "volumeMounts": [{"name": "data", "mountPath": pvc.mount_path}],
+        "securityContext": _container_security_context(),
     }
     if config.ports:
         main_container["ports"] = [
@@ -237,31 +315,26 @@ def render_deployment(
     if main_env_from:
         main_container["envFrom"] = main_env_from
 
+    # Built innermost-first so each small dict is completed before the next
+    # allocation, instead of one deeply nested literal.
+    pod_spec: dict[str, Any] = {
+        "securityContext": _pod_security_context(),
+        "containers": [main_container],
+        "volumes": [{"name": "data", "persistentVolumeClaim": {"claimName": pvc.name}}],
+    }
+    template = {"metadata": {"labels": labels}, "spec": pod_spec}
     return {
         "apiVersion": "apps/v1",
         "kind": "Deployment",
         "metadata": {
-            "name": config.app_name,
+            "name": app_name,
             "namespace": config.namespace,
             "labels": labels,
         },
         "spec": {
             "replicas": 1,
-            "selector": {"matchLabels": _selector_labels(config.app_name, "game")},
-            "template": {
-                "metadata": {"labels": labels},
-                "spec": {
-                    "securityContext": {
-                        "seccompProfile": {"type": "RuntimeDefault"},
-                        "runAsNonRoot": True,
-                        "runAsUser": 1000,
-                        "runAsGroup": 1000,
-                        "fsGroup": 1000,
-                    },
-                    "containers": [main_container],
-                    "volumes": [{"name": "data", "persistentVolumeClaim": {"claimName": config.pvc.name}}],
-                },
-            },
+            "selector": {"matchLabels": _selector_labels(app_name, "game")},
+            "template": template,
         },
     }
 
@@ -269,77 +342,70 @@ def render_deployment(
 def render_file_manager_deployment(
     config: UserConfig,
 ) -> dict[str, Any]:
-    labels = _labels(config.app_name, component="file-manager")
+    app_name = config.app_name
+    file_manager = config.file_manager
+    names = _names(app_name)
+    labels = _labels(app_name, component="file-manager")
     file_manager_env: list[dict[str, Any]] = [
-        {"name": "FB_ROOT", "value": "/data"},
-        {"name": "FB_ADDRESS", "value": "0.0.0.0"},
-        {"name": "FB_PORT", "value": str(config.file_manager.port)},
-        {"name": "FB_DATABASE", "value": "/config/filebrowser.db"},
+        dict(_FM_ENV_ROOT),
+        dict(_FM_ENV_ADDRESS),
+        {"name": "FB_PORT", "value": str(file_manager.port)},
+        dict(_FM_ENV_DATABASE),
     ]
 
     file_manager_container = {
         "name": "file-manager",
-        "image": config.file_manager.image,
+        "image": file_manager.image,
         "env": file_manager_env,
         "ports": [
             {
-                "containerPort": config.file_manager.port,
+                "containerPort": file_manager.port,
                 "protocol": "TCP",
-                "name": normalize_port_name("file-ui"),
+                "name": _FILE_UI_PORT_NAME,
             }
         ],
         "volumeMounts": [
             {"name": "data", "mountPath": "/data"},
             {"name": "config", "mountPath": "/config"},
         ],
-        "securityContext": {
-            "allowPrivilegeEscalation": False,
-            "capabilities": {"drop": ["ALL"]},
-            "runAsNonRoot": True,
-        },
+        "securityContext": _container_security_context(runAsNonRoot=True),
     }
 
+    pod_spec: dict[str, Any] = {
+        "securityContext": _pod_security_context(),
+        "containers": [file_manager_container],
+        "volumes": [
+            {"name": "data", "persistentVolumeClaim": {"claimName": config.pvc.name}},
+            {"name": "config", "persistentVolumeClaim": {"claimName": names.fm_config}},
+        ],
+    }
+    template = {"metadata": {"labels": labels}, "spec": pod_spec}
     return {
         "apiVersion": "apps/v1",
         "kind": "Deployment",
         "metadata": {
-            "name": f"{config.app_name}-ftp",
+            "name": names.ftp,
             "namespace": config.namespace,
             "labels": labels,
         },
         "spec": {
             "replicas": 1,
-            "selector": {"matchLabels": _selector_labels(config.app_name, "file-manager")},
-            "template": {
-                "metadata": {"labels": labels},
-                "spec": {
-                    "securityContext": {
-                        "seccompProfile": {"type": "RuntimeDefault"},
-                        "runAsNonRoot": True,
-                        "runAsUser": 1000,
-                        "runAsGroup": 1000,
-                        "fsGroup": 1000,
-                    },
-                    "containers": [file_manager_container],
-                    "volumes": [
-                        {"name": "data", "persistentVolumeClaim": {"claimName": config.pvc.name}},
-                        {"name": "config", "persistentVolumeClaim": {"claimName": f"{config.app_name}-fm-config"}},
-                    ],
-                },
-            },
+            "selector": {"matchLabels": _selector_labels(app_name, "file-manager")},
+            "template": template,
         },
     }
 
 
 def render_service(config: UserConfig) -> dict[str, Any]:
-    ports: list[dict[str, Any]] = []
-    for spec in config.ports:
-        ports.append({
+    ports: list[dict[str, Any]] = [
+        {
             "name": spec.name,
             "port": spec.container_port,
             "targetPort": spec.container_port,
             "protocol": spec.protocol,
-        })
+        }
+        for spec in config.ports
+    ]
     return {
         "apiVersion": "v1",
         "kind": "Service",
@@ -359,7 +425,7 @@ def render_service(config: UserConfig) -> dict[str, Any]:
 def render_file_manager_service(config: UserConfig) -> dict[str, Any]:
     ports: list[dict[str, Any]] = [
         {
-            "name": normalize_port_name("file-ui"),
+            "name": _FILE_UI_PORT_NAME,
             "port": config.file_manager.port,
             "targetPort": config.file_manager.port,
             "protocol": "TCP",
@@ -369,7 +435,7 @@ def render_file_manager_service(config: UserConfig) -> dict[str, Any]:
         "apiVersion": "v1",
         "kind": "Service",
         "metadata": {
-            "name": f"{config.app_name}-ftp",
+            "name": _names(config.app_name).ftp,
             "namespace": config.namespace,
             "labels": _labels(config.app_name, component="file-manager"),
         },
@@ -381,8 +447,15 @@ def render_file_manager_service(config: UserConfig) -> dict[str, Any]:
     }
 
 
-def render_all(config: UserConfig, secret_filename: str = "secret.yaml") -> dict[str, dict[str, Any]]:
-    configmap_data, secret_env = _split_env(config.env)
+def iter_manifests(config: UserConfig, secret_filename: str = "secret.yaml"):
+    """Yield (filename, manifest) pairs one at a time.
+
+    Callers that write files as they go can dump and drop each tree instead
+    of holding every manifest in memory at once; render_all keeps the
+    dict-returning interface on top of this.
+    """
+    names = _names(config.app_name)
+    configmap_data, secret_env, sensitive_keys = _split_env(config.env)
     if config.startup_command:
         startup = config.startup_command
         if "{{SERVER_MEMORY}}" in startup and config.resources and config.resources.limits_memory:
@@ -393,34 +466,47 @@ def render_all(config: UserConfig, secret_filename: str = "secret.yaml") -> dict
         configmap_data["STARTUP"] = startup
 
     secret_data = dict(secret_env)
-    secret_name = f"{config.app_name}-secret" if secret_data else None
+    secret_name = names.secret if secret_data else None
 
-    manifests: dict[str, dict[str, Any]] = {
-        "namespace.yaml": render_namespace(config),
-        "pvc.yaml": render_pvc(config),
-    }
-    manifests["fm-config-pvc.yaml"] = render_file_manager_config_pvc(config)
+    yield "namespace.yaml", render_namespace(config)
+    yield "pvc.yaml", render_pvc(config)
+    yield "fm-config-pvc.yaml", render_file_manager_config_pvc(config)
     if configmap_data:
-        manifests["configmap.yaml"] = render_configmap(config, configmap_data)
+        yield "configmap.yaml", render_configmap(config, configmap_data)
     if secret_data:
-        manifests[secret_filename] = render_secret(config, secret_data)
+        yield secret_filename, render_secret(config, secret_data)
     if config.install:
-        manifests["installer-configmap.yaml"] = render_installer_configmap(config)
-    deployment = render_deployment(config, configmap_data, secret_name, list(secret_env.keys()))
+        yield "installer-configmap.yaml", render_installer_configmap(config)
+    deployment = render_deployment(config, configmap_data, secret_name, sensitive_keys)
     if config.install:
-        configmap_name = f"{config.app_name}-config" if configmap_data else None
+        configmap_name = names.config_map if configmap_data else None
         init_container = _build_init_container(config, configmap_name, secret_name)
         deployment["spec"]["template"]["spec"]["initContainers"] = [init_container]
         volumes = deployment["spec"]["template"]["spec"]["volumes"]
         volumes.append(
             {
                 "name": "installer",
-                "configMap": {"name": f"{config.app_name}-installer"},
+                "configMap": {"name": names.installer},
             }
         )
-    manifests["deployment.yaml"] = deployment
-    manifests["ftp-deployment.yaml"] = render_file_manager_deployment(config)
+    yield "deployment.yaml", deployment
+    yield "ftp-deployment.yaml", render_file_manager_deployment(config)
     if config.ports:
-        manifests["service.yaml"] = render_service(config)
-    manifests["ftp-service.yaml"] = render_file_manager_service(config)
-    return manifests
+        yield "service.yaml", render_service(config)
+    yield "ftp-service.yaml", render_file_manager_service(config)
+
+
+def render_all(config: UserConfig, secret_filename: str = "secret.yaml") -> dict[str, dict[str, Any]]:
+    return dict(iter_manifests(config, secret_filename=secret_filename))
+
+
+def render_all_yaml(config: UserConfig, secret_filename: str = "secret.yaml") -> str:
+    """Serialize every manifest into one multi-document YAML string.
+
+    Dumps all manifests through a single shared engine in one pass, which is
+    the cheapest path for callers that want the whole bundle rather than
+    per-file writes.
+    """
+    buffer = io.StringIO()
+    _YAML.dump_all(render_all(config, secret_filename=secret_filename).values(), buffer)
+    return buffer.getvalue()
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, Tuple
+from functools import lru_cache
+from typing import Iterable, NoReturn, Tuple
 
 
 
 _K8S_NAME_RE = re.compile(r"[^a-z0-9-]+")
 _ENV_RE = re.compile(r"[^A-Z0-9_]+")
+_DASH_RE = re.compile(r"-+")
+_UNDERSCORE_RE = re.compile(r"_+")
 
 
+@lru_cache(maxsize=256)
 def normalize_k8s_name(value: str, *, max_length: int = 63) -> str:
     value = value.strip().lower()
     value = _K8S_NAME_RE.sub("-", value)
-    value = re.sub(r"-+", "-", value)
+    value = _DASH_RE.sub("-", value)
     value = value.strip("-")
     if not value:
         return "app"
@@ -25,6 +29,7 @@ def normalize_k8s_name(value: str, *, max_length: int = 63) -> str:
     return value
 
 
+@lru_cache(maxsize=256)
 def normalize_port_name(value: str) -> str:
     value = normalize_k8s_name(value)
     if value[0].isdigit():
@@ -32,10 +37,21 @@ def normalize_port_name(value: str) -> str:
     return value
 
 
+# Uppercase + non-alnum substitution in one C-level pass for ASCII input.
+_ENV_TRANS = {
+    i: chr(i).upper() if chr(i).isalnum() or chr(i) == "_" else "_"
+    for i in range(128)
+}
+
+
+@lru_cache(maxsize=256)
 def normalize_env_var(value: str) -> str:
-    value = value.strip().upper()
-    value = _ENV_RE.sub("_", value)
-    value = re.sub(r"_+", "_", value)
+    value = value.strip()
+    if value.isascii():
+        value = value.translate(_ENV_TRANS)
+    else:
+        value = _ENV_RE.sub("_", value.upper())
+    value = _UNDERSCORE_RE.sub("_", value)
     value = value.strip("_")
     if not value:
         return "VAR"
@@ -44,31 +60,35 @@ def normalize_env_var(value: str) -> str:
     return value
 
 
+_PORT_SPLIT_RE = re.compile(r"[\s,]+")
+_PORT_TOKEN_RE = re.compile(r"(\d+)(?:-(\d+))?")
+
+
 def parse_ports(text: str) -> list[int]:
-    parts = re.split(r"[\s,]+", text.strip())
-    ports: list[int] = []
-    for part in parts:
-        if not part:
+    # A bytearray indexed by port doubles as the dedup set and keeps the
+    # output sorted for free, replacing sorted(set(...)) at the end.
+    seen = bytearray(65536)
+    for part in _PORT_SPLIT_RE.split(text.strip()):
+        # fullmatch (not finditer over the raw text) so digits embedded in
+        # junk tokens are still rejected, as before.
+        match = _PORT_TOKEN_RE.fullmatch(part)
+        if not match:
             continue
-        if "-" in part:
-            start, end = part.split("-", 1)
-            if start.isdigit() and end.isdigit():
-                start_i, end_i = int(start), int(end)
-                if start_i > end_i:
-                    start_i, end_i = end_i, start_i
-                for port in range(start_i, end_i + 1):
-                    if 1 <= port <= 65535:
-                        ports.append(port)
-            continue
-        if part.isdigit():
-            port = int(part)
-            if 1 <= port <= 65535:
-                ports.append(port)
-    return sorted(set(ports))
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if start > end:
+            start, end = end, start
+        for port in range(max(start, 1), min(end, 65535) + 1):
+            seen[port] = 1
+    return [port for port, hit in enumerate(seen) if hit]
 
 
-def parse_passive_range(text: str) -> Tuple[int, int]:
-    cleaned = text.strip().replace(":", "-")
+_RANGE_RE = re.compile(r"(\d+)-(\d+)")
+
+
+def _raise_range_err(cleaned: str) -> NoReturn:
+    # Cold path: re-run the original checks so each failure keeps its
+    # specific message.
     if "-" not in cleaned:
         raise ValueError("Passive range must look like 21000-21010")
     start_s, end_s = cleaned.split("-", 1)
@@ -77,20 +97,22 @@ def parse_passive_range(text: str) -> Tuple[int, int]:
     start, end = int(start_s), int(end_s)
     if start <= 0 or end <= 0 or start > end:
         raise ValueError("Passive range must be positive and start <= end")
-    if end > 65535:
-        raise ValueError("Passive range must be <= 65535")
-    return start, end
+    raise ValueError("Passive range must be <= 65535")
+
+
+def parse_passive_range(text: str) -> Tuple[int, int]:
+    cleaned = text.strip().replace(":", "-")
+    match = _RANGE_RE.fullmatch(cleaned)
+    if match is not None:
+        start, end = int(match.group(1)), int(match.group(2))
+        if 0 < start <= end <= 65535:
+            return start, end
+    _raise_range_err(cleaned)
 
 
 def ensure_unique(items: Iterable[str]) -> list[str]:
-    seen: set[str] = set()
-    output: list[str] = []
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        output.append(item)
-    return output
+    # dict.fromkeys dedups at C speed while preserving insertion order.
+    return list(dict.fromkeys(items))
 
 
 _STARTUP_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
@@ -99,29 +121,22 @@ _STARTUP_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
 STARTUP_BUILTIN_VARS = {"SERVER_MEMORY"}
 
 
-def extract_startup_vars(startup: str) -> set[str]:
-    """Extract all {{VAR_NAME}} references from a startup command."""
-    return set(_STARTUP_VAR_RE.findall(startup))
+@lru_cache(maxsize=256)
+def extract_startup_vars(startup: str) -> frozenset[str]:
+    """Extract all {{VAR_NAME}} references from a startup command.
+
+    Returns a frozenset since results are memoized and shared.
+    """
+    return frozenset(_STARTUP_VAR_RE.findall(startup))
+
+
+_MEM_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*(gib|gi|gb|g|mib|mi|mb|m)?$")
+_MEM_MULTIPLIERS = {"gib": 1024, "gi": 1024, "gb": 1000, "g": 1000}
 
 
 def memory_to_mb(value: str) -> int | None:
-    raw = value.strip().lower()
-    if not raw:
+    match = _MEM_RE.match(value.strip().lower())
+    if not match:
         return None
-    unit = None
-    for suffix in ("gib", "gi", "gb", "g", "mib", "mi", "mb", "m"):
-        if raw.endswith(suffix):
-            unit = suffix
-            raw = raw[: -len(suffix)]
-            break
-    raw = raw.strip()
-    if not raw or not raw.replace(".", "", 1).isdigit():
-        return None
-    amount = float(raw)
-    if unit in {"gib", "gi"}:
-        mb = amount * 1024
-    elif unit in {"gb", "g"}:
-        mb = amount * 1000
-    else:
-        mb = amount
-    return int(mb)
+    amount, unit = match.groups()
+    return int(float(amount) * _MEM_MULTIPLIERS.get(unit, 1))
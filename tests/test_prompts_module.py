@@ -0,0 +1,17 @@
+import ast
+import inspect
+
+import kubeegg.prompts
+
+
+def test_prompts_defines_each_name_exactly_once():
+    # Guard against the module being concatenated/duplicated during merges:
+    # every top-level function or class must be defined exactly once.
+    tree = ast.parse(inspect.getsource(kubeegg.prompts))
+    names = [
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    ]
+    duplicates = {name for name in names if names.count(name) > 1}
+    assert not duplicates
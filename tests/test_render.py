@@ -1,5 +1,7 @@
+from ruamel.yaml import YAML
+
 from kubeegg.models import EnvSelection, FileManagerConfig, PVCSpec, PortSpec, ResourceValues, UserConfig
-from kubeegg.render import render_all
+from kubeegg.render import render_all, render_all_yaml
 
 
 def test_render_all_outputs():
@@ -75,3 +77,35 @@ def test_render_all_outputs():
     assert "/config" in mounts
     config_mount = next(m for m in fm_container["volumeMounts"] if m["mountPath"] == "/config")
     assert "readOnly" not in config_mount
+
+
+def test_render_all_yaml_round_trips():
+    config = UserConfig(
+        app_name="demo",
+        namespace="demo",
+        image="example/image:latest",
+        pvc=PVCSpec(
+            name="demo-data",
+            size="10Gi",
+            mount_path="/data",
+            access_modes=["ReadWriteOnce"],
+            storage_class_name=None,
+        ),
+        env=[
+            EnvSelection(key="PUBLIC_VAR", value="foo", sensitive=False),
+            EnvSelection(key="SECRET_VAR", value="bar", sensitive=True),
+        ],
+        ports=[
+            PortSpec(container_port=25565, protocol="TCP", name="game-25565"),
+        ],
+        file_manager=FileManagerConfig(
+            image="hurlenko/filebrowser:latest",
+            port=8080,
+        ),
+        startup_command=None,
+    )
+
+    manifests = render_all(config)
+    documents = list(YAML(typ="safe").load_all(render_all_yaml(config)))
+
+    assert documents == list(manifests.values())